@@ -1,63 +1,167 @@
 import pandas as pd
 import os
 import json
+from typing import List, Optional, Tuple
 
-def generate_statistics(input_path: str, output_path: str, output_file: str = "stats.html") -> None:
+from data.solution.model import Department, Project, Person
+
+STATS_FILE = "stats.json"
+
+def compute_aggregates(people_df: pd.DataFrame, depts_df: pd.DataFrame, projects_df: pd.DataFrame,
+                       dept_assign_df: pd.DataFrame) -> dict:
+    """
+    Calculates additive aggregates (counts, sums, min/max) that can later be merged with merge_aggregates.
+    """
+    # Merge for Department Stats
+    people_dept = pd.merge(people_df, dept_assign_df, left_on="id", right_on="person_id")
+    people_dept = pd.merge(people_dept, depts_df, left_on="department_id", right_on="id", suffixes=("_person", "_dept"))
+
+    # We want a dictionary where keys are Department Names and values are lists of employees
+    dept_data = {}
+    for dept_name in depts_df["name"].unique():
+        dept_employees = people_dept[people_dept["name_dept"] == dept_name]
+        employees_list = []
+        for _, row in dept_employees.iterrows():
+            employees_list.append({
+                "name": row["name_person"],
+                "age": int(row["age"]),
+                "job": row["job"],
+                "salary": int(row["salary"])
+            })
+
+        dept_data[dept_name] = {
+            "count": len(dept_employees),
+            "age_sum": int(dept_employees["age"].sum()),
+            "salary_sum": int(dept_employees["salary"].sum()),
+            "employees": employees_list
+        }
+
+    budgets = projects_df["budget"]
+    return {
+        "departments": dept_data,
+        "budget": {
+            "count": len(budgets),
+            "sum": int(budgets.sum()),
+            "min": int(budgets.min()) if not budgets.empty else None,
+            "max": int(budgets.max()) if not budgets.empty else None
+        },
+        "status_counts": {str(k): int(v) for k, v in projects_df["status"].value_counts().items()}
+    }
+
+def merge_aggregates(base: dict, delta: dict) -> dict:
+    """Adds the aggregates in delta to base without recomputing base."""
+    for dept_name, d in delta["departments"].items():
+        b = base["departments"].setdefault(dept_name, {"count": 0, "age_sum": 0, "salary_sum": 0, "employees": []})
+        b["count"] += d["count"]
+        b["age_sum"] += d["age_sum"]
+        b["salary_sum"] += d["salary_sum"]
+        b["employees"].extend(d["employees"])
+
+    b, d = base["budget"], delta["budget"]
+    b["count"] += d["count"]
+    b["sum"] += d["sum"]
+    mins = [v for v in (b["min"], d["min"]) if v is not None]
+    maxs = [v for v in (b["max"], d["max"]) if v is not None]
+    b["min"] = min(mins) if mins else None
+    b["max"] = max(maxs) if maxs else None
+
+    for status, count in delta["status_counts"].items():
+        base["status_counts"][status] = base["status_counts"].get(status, 0) + count
+    return base
+
+def read_aggregates(path: str, file_name: str = STATS_FILE) -> dict:
+    with open(os.path.join(path, file_name), "r", encoding="utf-8") as file:
+        return json.load(file)
+
+def write_aggregates(aggregates: dict, path: str, file_name: str = STATS_FILE) -> None:
+    # Swap in a complete file, so a crash mid-write can't leave aggregates that fail to load
+    tmp_path = os.path.join(path, file_name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump(aggregates, file)
+    os.replace(tmp_path, os.path.join(path, file_name))
+
+def generate_statistics(input_path: str, output_path: str, output_file: str = "stats.html",
+                        person_mark: Optional[int] = None) -> None:
     """
     Reads CSV files from input_path, calculates statistics, and exports to an interactive HTML report in output_path.
+    The aggregates are also saved next to the report so update_statistics can extend them later.
     """
     try:
-        # Load data
-        people_df = pd.read_csv(os.path.join(input_path, "people.csv"), sep=";")
-        depts_df = pd.read_csv(os.path.join(input_path, "departments.csv"), sep=";")
-        projects_df = pd.read_csv(os.path.join(input_path, "projects.csv"), sep=";")
-        dept_assign_df = pd.read_csv(os.path.join(input_path, "dept_assignments.csv"), sep=";")
-        
-        # Merge for Department Stats
-        people_dept = pd.merge(people_df, dept_assign_df, left_on="id", right_on="person_id")
-        people_dept = pd.merge(people_dept, depts_df, left_on="department_id", right_on="id", suffixes=("_person", "_dept"))
-
-        # Prepare data for JavaScript
-        # We want a dictionary where keys are Department Names and values are lists of employees
-        dept_data = {}
-        for dept_name in depts_df["name"].unique():
-            dept_employees = people_dept[people_dept["name_dept"] == dept_name]
-            employees_list = []
-            for _, row in dept_employees.iterrows():
-                employees_list.append({
-                    "name": row["name_person"],
-                    "age": row["age"],
-                    "job": row["job"],
-                    "salary": row["salary"]
-                })
-            
-            # Calculate dept stats
-            avg_age = dept_employees["age"].mean() if not dept_employees.empty else 0
-            avg_salary = dept_employees["salary"].mean() if not dept_employees.empty else 0
-            
-            dept_data[dept_name] = {
-                "avg_age": round(avg_age, 1),
-                "avg_salary": round(avg_salary, 0),
-                "count": len(dept_employees),
-                "employees": employees_list
-            }
-
-        # Project Stats
-        proj_stats = projects_df.agg({"budget": ["sum", "mean", "min", "max"]}).reset_index()
-        proj_stats.columns = ["Metric", "Value"]
-        proj_stats["Value"] = proj_stats["Value"].round(2)
-        proj_html = proj_stats.to_html(index=False, classes="table table-striped")
-        
-        # Status distribution
-        status_counts = projects_df["status"].value_counts().reset_index()
-        status_counts.columns = ["Status", "Count"]
-        status_html = status_counts.to_html(index=False, classes="table table-striped")
-
-        # JSON serialization for JS
-        dept_data_json = json.dumps(dept_data)
-
-        # HTML Template
-        html_content = f"""
+        build_statistics(input_path, output_path, output_file, person_mark)
+
+    except Exception as e:
+        print(f"Error generating statistics: {e}")
+        import traceback
+        traceback.print_exc()
+
+def build_statistics(input_path: str, output_path: str, output_file: str = "stats.html",
+                     person_mark: Optional[int] = None) -> None:
+    """
+    Same as generate_statistics, but raises on failure.
+    person_mark is the person high-water mark the CSV data covers; it is stored with the aggregates.
+    """
+    # Load data
+    people_df = pd.read_csv(os.path.join(input_path, "people.csv"), sep=";")
+    depts_df = pd.read_csv(os.path.join(input_path, "departments.csv"), sep=";")
+    projects_df = pd.read_csv(os.path.join(input_path, "projects.csv"), sep=";")
+    dept_assign_df = pd.read_csv(os.path.join(input_path, "dept_assignments.csv"), sep=";")
+
+    aggregates = compute_aggregates(people_df, depts_df, projects_df, dept_assign_df)
+    aggregates["person_mark"] = person_mark
+    render_statistics(aggregates, output_path, output_file)
+    # Saved last, so aggregates on disk never claim a mark the report didn't reach
+    write_aggregates(aggregates, output_path)
+
+def update_statistics(new_people: List[Person], departments: List[Department], new_projects: List[Project],
+                      new_dept_assignments: List[Tuple[str, str, str, int]], output_path: str,
+                      output_file: str = "stats.html", person_mark: Optional[int] = None) -> None:
+    """
+    Merges only the newly appended records into the saved aggregates and re-renders the HTML report.
+    departments must contain every department, since new people may join existing ones.
+    Unlike generate_statistics this raises on failure, so an append cannot silently leave the report behind the data.
+    """
+    people_df = pd.DataFrame([p.__dict__ for p in new_people], columns=["id", "name", "age", "male"])
+    depts_df = pd.DataFrame([d.__dict__ for d in departments], columns=["id", "name", "floor"])
+    projects_df = pd.DataFrame([p.__dict__ for p in new_projects], columns=["id", "name", "budget", "deadline", "status"])
+    dept_assign_df = pd.DataFrame(new_dept_assignments, columns=["person_id", "department_id", "job", "salary"])
+
+    delta = compute_aggregates(people_df, depts_df, projects_df, dept_assign_df)
+    aggregates = merge_aggregates(read_aggregates(output_path), delta)
+    aggregates["person_mark"] = person_mark
+    render_statistics(aggregates, output_path, output_file)
+    write_aggregates(aggregates, output_path)
+
+def render_statistics(aggregates: dict, output_path: str, output_file: str = "stats.html") -> None:
+    # Prepare data for JavaScript
+    dept_data = {}
+    for dept_name, d in aggregates["departments"].items():
+        count = d["count"]
+        dept_data[dept_name] = {
+            "avg_age": round(d["age_sum"] / count, 1) if count else 0,
+            "avg_salary": round(d["salary_sum"] / count, 0) if count else 0,
+            "count": count,
+            "employees": d["employees"]
+        }
+
+    # Project Stats
+    budget = aggregates["budget"]
+    proj_stats = pd.DataFrame({
+        "Metric": ["sum", "mean", "min", "max"],
+        "Value": [budget["sum"], budget["sum"] / budget["count"] if budget["count"] else 0, budget["min"], budget["max"]]
+    })
+    proj_stats["Value"] = proj_stats["Value"].astype(float).round(2)
+    proj_html = proj_stats.to_html(index=False, classes="table table-striped")
+
+    # Status distribution
+    status_counts = pd.Series(aggregates["status_counts"], dtype="int64").sort_values(ascending=False).reset_index()
+    status_counts.columns = ["Status", "Count"]
+    status_html = status_counts.to_html(index=False, classes="table table-striped")
+
+    # JSON serialization for JS
+    dept_data_json = json.dumps(dept_data)
+
+    # HTML Template
+    html_content = f"""
         <!DOCTYPE html>
         <html>
         <head>
@@ -181,12 +285,7 @@ def generate_statistics(input_path: str, output_path: str, output_file: str = "s
         </html>
         """
 
-        with open(os.path.join(output_path, output_file), "w", encoding="utf-8") as f:
-            f.write(html_content)
-            
-        print(f"Interactive statistics generated successfully: {os.path.join(output_path, output_file)}")
+    with open(os.path.join(output_path, output_file), "w", encoding="utf-8") as f:
+        f.write(html_content)
 
-    except Exception as e:
-        print(f"Error generating statistics: {e}")
-        import traceback
-        traceback.print_exc()
+    print(f"Interactive statistics generated successfully: {os.path.join(output_path, output_file)}")
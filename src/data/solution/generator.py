@@ -1,15 +1,15 @@
 import random
 from faker import Faker
 from datetime import date
-from typing import List, Tuple
+from typing import Iterable, List, Tuple
 
 from data.solution.model import Department, Project, Person
 
 def generate_people(n: int, male_ratio: float = 0.5, locale: str = "en_US",
-                    unique: bool = False, min_age: int = 0, max_age: int = 100) -> List[Person]:
+                    unique: bool = False, min_age: int = 0, max_age: int = 100, start: int = 0) -> List[Person]:
     fake = Faker(locale)
     people = []
-    for i in range(n):
+    for i in range(start, start + n):
         male = random.random() < male_ratio
         generator = fake if not unique else fake.unique
         people.append(Person(
@@ -19,22 +19,22 @@ def generate_people(n: int, male_ratio: float = 0.5, locale: str = "en_US",
             male))
     return people
 
-def generate_departments(n: int, locale: str = "en_US") -> List[Department]:
+def generate_departments(n: int, locale: str = "en_US", start: int = 1) -> List[Department]:
     fake = Faker(locale)
     departments = []
-    for i in range(n):
-        dept_id = f"D-{str(i+1).zfill(3)}"
+    for i in range(start, start + n):
+        dept_id = f"D-{str(i).zfill(3)}"
         name = fake.job() + " Department"
         floor = random.randint(1, 10)
         departments.append(Department(dept_id, name, floor))
     return departments
 
-def generate_projects(n: int, locale: str = "en_US") -> List[Project]:
+def generate_projects(n: int, locale: str = "en_US", start: int = 1) -> List[Project]:
     fake = Faker(locale)
     projects = []
     statuses = ["Active", "Completed", "Pending"]
-    for i in range(n):
-        proj_id = f"P-{str(i+1).zfill(3)}"
+    for i in range(start, start + n):
+        proj_id = f"P-{str(i).zfill(3)}"
         name = fake.bs().title()
         budget = random.randint(10000, 1000000)
         deadline = fake.future_date(end_date="+2y")
@@ -42,6 +42,14 @@ def generate_projects(n: int, locale: str = "en_US") -> List[Project]:
         projects.append(Project(proj_id, name, budget, deadline, status))
     return projects
 
+def id_number(id: str) -> int:
+    """Returns the numeric part of an ID such as "O-000042" or "D-007"."""
+    return int(id.split("-", 1)[1])
+
+def high_water_mark(ids: Iterable[str]) -> int:
+    """Returns the largest numeric part of the IDs, or -1 if there are none."""
+    return max((id_number(i) for i in ids), default=-1)
+
 def assign_departments(people: List[Person], departments: List[Department]) -> List[Tuple[str, str, str, int]]:
     """Assigns people to departments (1:N) with job and salary."""
     fake = Faker()
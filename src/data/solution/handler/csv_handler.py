@@ -1,6 +1,9 @@
 import csv
+import json
 import os
-from typing import List, Tuple
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, Optional, Tuple
 from datetime import date
 
 from data.solution.model import Department, Project, Person
@@ -10,10 +13,11 @@ def read_people(path: str, file_name: str = "people.csv", delimiter: str = ";")
         reader = csv.DictReader(file, delimiter=delimiter)
         return [Person(row["id"], row["name"], int(row["age"]), row["male"] == "True") for row in reader]
 
-def write_people(people: List[Person], path: str, file_name: str = "people.csv", delimiter: str = ";") -> None:
-    with open(os.path.join(path, file_name), "w", newline="", encoding="utf-8") as file:
+def write_people(people: List[Person], path: str, file_name: str = "people.csv", delimiter: str = ";", append: bool = False) -> None:
+    with open(os.path.join(path, file_name), "a" if append else "w", newline="", encoding="utf-8") as file:
         writer = csv.DictWriter(file, fieldnames=["id", "name", "age", "male"], delimiter=delimiter)
-        writer.writeheader()
+        if not append:
+            writer.writeheader()
         for person in people:
             writer.writerow(person.__dict__)
 
@@ -22,17 +26,19 @@ def read_departments(path: str, file_name: str = "departments.csv", delimiter: s
         reader = csv.DictReader(file, delimiter=delimiter)
         return [Department(row["id"], row["name"], int(row["floor"])) for row in reader]
 
-def write_departments(departments: List[Department], path: str, file_name: str = "departments.csv", delimiter: str = ";") -> None:
-    with open(os.path.join(path, file_name), "w", newline="", encoding="utf-8") as file:
+def write_departments(departments: List[Department], path: str, file_name: str = "departments.csv", delimiter: str = ";", append: bool = False) -> None:
+    with open(os.path.join(path, file_name), "a" if append else "w", newline="", encoding="utf-8") as file:
         writer = csv.DictWriter(file, fieldnames=["id", "name", "floor"], delimiter=delimiter)
-        writer.writeheader()
+        if not append:
+            writer.writeheader()
         for dept in departments:
             writer.writerow(dept.__dict__)
 
-def write_projects(projects: List[Project], path: str, file_name: str = "projects.csv", delimiter: str = ";") -> None:
-    with open(os.path.join(path, file_name), "w", newline="", encoding="utf-8") as file:
+def write_projects(projects: List[Project], path: str, file_name: str = "projects.csv", delimiter: str = ";", append: bool = False) -> None:
+    with open(os.path.join(path, file_name), "a" if append else "w", newline="", encoding="utf-8") as file:
         writer = csv.DictWriter(file, fieldnames=["id", "name", "budget", "deadline", "status"], delimiter=delimiter)
-        writer.writeheader()
+        if not append:
+            writer.writeheader()
         for proj in projects:
             row = proj.__dict__.copy()
             row["deadline"] = proj.deadline.isoformat()
@@ -43,10 +49,11 @@ def read_projects(path: str, file_name: str = "projects.csv", delimiter: str = "
         reader = csv.DictReader(file, delimiter=delimiter)
         return [Project(row["id"], row["name"], int(row["budget"]), date.fromisoformat(row["deadline"]), row["status"]) for row in reader]
 
-def write_dept_assignments(assignments: List[Tuple[str, str, str, int]], path: str, file_name: str = "dept_assignments.csv", delimiter: str = ";") -> None:
-    with open(os.path.join(path, file_name), "w", newline="", encoding="utf-8") as file:
+def write_dept_assignments(assignments: List[Tuple[str, str, str, int]], path: str, file_name: str = "dept_assignments.csv", delimiter: str = ";", append: bool = False) -> None:
+    with open(os.path.join(path, file_name), "a" if append else "w", newline="", encoding="utf-8") as file:
         writer = csv.writer(file, delimiter=delimiter)
-        writer.writerow(["person_id", "department_id", "job", "salary"])
+        if not append:
+            writer.writerow(["person_id", "department_id", "job", "salary"])
         writer.writerows(assignments)
 
 def read_dept_assignments(path: str, file_name: str = "dept_assignments.csv", delimiter: str = ";") -> List[Tuple[str, str, str, int]]:
@@ -55,10 +62,11 @@ def read_dept_assignments(path: str, file_name: str = "dept_assignments.csv", de
         next(reader) # Skip header
         return [(row[0], row[1], row[2], int(row[3])) for row in reader]
 
-def write_proj_assignments(assignments: List[Tuple[str, str]], path: str, file_name: str = "proj_assignments.csv", delimiter: str = ";") -> None:
-    with open(os.path.join(path, file_name), "w", newline="", encoding="utf-8") as file:
+def write_proj_assignments(assignments: List[Tuple[str, str]], path: str, file_name: str = "proj_assignments.csv", delimiter: str = ";", append: bool = False) -> None:
+    with open(os.path.join(path, file_name), "a" if append else "w", newline="", encoding="utf-8") as file:
         writer = csv.writer(file, delimiter=delimiter)
-        writer.writerow(["person_id", "project_id"])
+        if not append:
+            writer.writerow(["person_id", "project_id"])
         writer.writerows(assignments)
 
 def read_proj_assignments(path: str, file_name: str = "proj_assignments.csv", delimiter: str = ";") -> List[Tuple[str, str]]:
@@ -66,3 +74,151 @@ def read_proj_assignments(path: str, file_name: str = "proj_assignments.csv", de
         reader = csv.reader(file, delimiter=delimiter)
         next(reader) # Skip header
         return [(row[0], row[1]) for row in reader]
+
+MANIFEST_FILE = "_manifest.json"
+PARTITION_FILES = {
+    "people": "people.csv",
+    "dept_assignments": "dept_assignments.csv",
+    "proj_assignments": "proj_assignments.csv",
+}
+
+def write_partitioned(people: List[Person], dept_assignments: List[Tuple[str, str, str, int]], proj_assignments: List[Tuple[str, str]],
+                      path: str, rows_per_partition: Optional[int] = None, by_department: bool = False, delimiter: str = ";") -> dict:
+    """
+    Writes people and their assignments as a partitioned dataset with a manifest.
+
+    People are split into partitions of at most rows_per_partition rows and, if by_department is set,
+    grouped by department_id first. A person's assignments always land in the same partition as the person.
+    """
+    os.makedirs(path, exist_ok=True)
+    manifest = {"partition_by": "department_id" if by_department else None, "rows_per_partition": rows_per_partition,
+                "delimiter": delimiter, "files": dict(PARTITION_FILES), "partitions": []}
+    _add_partitions(manifest, people, dept_assignments, proj_assignments, path, rows_per_partition)
+    _write_manifest(manifest, path)
+    return manifest
+
+def append_partitioned(people: List[Person], dept_assignments: List[Tuple[str, str, str, int]], proj_assignments: List[Tuple[str, str]],
+                       path: str, rows_per_partition: Optional[int] = None) -> dict:
+    """
+    Adds the given records to a partitioned dataset and updates the manifest.
+
+    The last partition of each key is topped up to rows_per_partition first, so frequent small appends
+    don't leave a trail of tiny files. It is rewritten under a new name and swapped in with the manifest;
+    existing partition files are never modified. Call remove_unreferenced_partitions to delete the
+    directories the manifest no longer points to.
+    """
+    manifest = read_manifest(path)
+    _add_partitions(manifest, people, dept_assignments, proj_assignments, path,
+                    manifest.get("rows_per_partition") if rows_per_partition is None else rows_per_partition,
+                    fill_last=True)
+    _write_manifest(manifest, path)
+    return manifest
+
+def remove_unreferenced_partitions(path: str) -> None:
+    """Deletes partition directories the manifest does not list, e.g. ones replaced by append_partitioned."""
+    referenced = {p["path"] for p in read_manifest(path)["partitions"]}
+    for root, dirs, _ in os.walk(path):
+        for d in list(dirs):
+            if not d.startswith("part-"):
+                continue
+            dirs.remove(d)
+            if os.path.relpath(os.path.join(root, d), path).replace(os.sep, "/") not in referenced:
+                shutil.rmtree(os.path.join(root, d))
+
+def read_manifest(path: str) -> dict:
+    with open(os.path.join(path, MANIFEST_FILE), "r", encoding="utf-8") as file:
+        return json.load(file)
+
+def read_people_partitioned(path: str, department_ids: Optional[Iterable[str]] = None, max_workers: Optional[int] = None) -> List[Person]:
+    return _read_partitions(path, "people", read_people, department_ids, max_workers)
+
+def read_dept_assignments_partitioned(path: str, department_ids: Optional[Iterable[str]] = None,
+                                      max_workers: Optional[int] = None) -> List[Tuple[str, str, str, int]]:
+    return _read_partitions(path, "dept_assignments", read_dept_assignments, department_ids, max_workers)
+
+def read_proj_assignments_partitioned(path: str, department_ids: Optional[Iterable[str]] = None,
+                                      max_workers: Optional[int] = None) -> List[Tuple[str, str]]:
+    return _read_partitions(path, "proj_assignments", read_proj_assignments, department_ids, max_workers)
+
+def _add_partitions(manifest: dict, people: List[Person], dept_assignments: List[Tuple[str, str, str, int]],
+                    proj_assignments: List[Tuple[str, str]], path: str, rows_per_partition: Optional[int],
+                    fill_last: bool = False) -> None:
+    if rows_per_partition is not None and rows_per_partition <= 0:
+        raise ValueError(f"rows_per_partition must be positive, got {rows_per_partition}")
+
+    dept_by_person = {a[0]: a for a in dept_assignments}
+    projs_by_person = {}
+    for a in proj_assignments:
+        projs_by_person.setdefault(a[0], []).append(a)
+
+    # Group people by partition key, keeping the input order inside each group
+    groups = {}
+    for person in people:
+        key = None
+        if manifest["partition_by"]:
+            if person.id not in dept_by_person:
+                raise ValueError(f"Person {person.id} has no department assignment to partition by")
+            key = dept_by_person[person.id][1]
+        groups.setdefault(key, []).append(person)
+
+    delimiter = manifest["delimiter"]
+    files = manifest["files"]
+    for key, members in groups.items():
+        existing = [p for p in manifest["partitions"] if p["department_id"] == key]
+        # Continue numbering after every part this key has had, so a replaced part's name is never reused
+        index = max((int(p["path"].rsplit("part-", 1)[1]) for p in existing), default=-1) + 1
+
+        if fill_last and rows_per_partition and existing and existing[-1]["rows"] < rows_per_partition:
+            last = existing[-1]
+            last_dir = os.path.join(path, last["path"])
+            carried = read_people(last_dir, files["people"], delimiter)
+            for a in read_dept_assignments(last_dir, files["dept_assignments"], delimiter):
+                dept_by_person[a[0]] = a
+            for a in read_proj_assignments(last_dir, files["proj_assignments"], delimiter):
+                projs_by_person.setdefault(a[0], []).append(a)
+            members = carried + members
+            manifest["partitions"].remove(last)
+
+        size = rows_per_partition or len(members)
+        for start in range(0, len(members), size):
+            chunk = members[start:start + size]
+            prefix = f"department_id={key}" if key is not None else ""
+            part_dir = os.path.join(prefix, f"part-{str(index).zfill(5)}")
+            full_dir = os.path.join(path, part_dir)
+            os.makedirs(full_dir, exist_ok=True)
+
+            chunk_depts = [dept_by_person[p.id] for p in chunk if p.id in dept_by_person]
+            chunk_projs = [a for p in chunk for a in projs_by_person.get(p.id, [])]
+            write_people(chunk, full_dir, files["people"], delimiter)
+            write_dept_assignments(chunk_depts, full_dir, files["dept_assignments"], delimiter)
+            write_proj_assignments(chunk_projs, full_dir, files["proj_assignments"], delimiter)
+
+            manifest["partitions"].append({"path": part_dir.replace(os.sep, "/"), "department_id": key, "rows": len(chunk)})
+            index += 1
+
+def _write_manifest(manifest: dict, path: str) -> None:
+    # Write next to the manifest and swap it in, so a crash mid-write never leaves a truncated manifest
+    tmp_path = os.path.join(path, MANIFEST_FILE + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=2)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, os.path.join(path, MANIFEST_FILE))
+
+def _read_partitions(path: str, entity: str, reader: Callable[..., list], department_ids: Optional[Iterable[str]],
+                     max_workers: Optional[int]) -> list:
+    manifest = read_manifest(path)
+    partitions = manifest["partitions"]
+    if department_ids is not None:
+        # Partition pruning: only touch directories whose key was requested
+        if manifest["partition_by"] != "department_id":
+            raise ValueError("Dataset is not partitioned by department_id")
+        # A bare string is one department ID, not an iterable of single characters
+        wanted = {department_ids} if isinstance(department_ids, str) else set(department_ids)
+        partitions = [p for p in partitions if p["department_id"] in wanted]
+
+    file_name = manifest["files"][entity]
+    delimiter = manifest["delimiter"]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(lambda p: reader(os.path.join(path, p["path"]), file_name, delimiter), partitions)
+        return [row for rows in results for row in rows]
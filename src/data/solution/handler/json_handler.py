@@ -13,6 +13,10 @@ def write_departments(departments: List[Department], path: str, file_name: str =
             indent=2 if pretty else None
         )
 
+def append_departments(departments: List[Department], path: str, file_name: str = "departments.json", pretty: bool = True) -> None:
+    # A JSON array cannot be extended in place, so the file is read back and rewritten
+    write_departments(read_departments(path, file_name) + departments, path, file_name, pretty)
+
 def read_departments(path: str, file_name: str = "departments.json") -> List[Department]:
     with open(os.path.join(path, file_name), "r", encoding="utf-8") as file:
         data = json.load(file)
@@ -35,3 +39,7 @@ def read_projects(path: str, file_name: str = "projects.json") -> List[Project]:
             d["deadline"] = date.fromisoformat(d["deadline"])
             projects.append(Project(**d))
         return projects
+
+def append_projects(projects: List[Project], path: str, file_name: str = "projects.json", pretty: bool = True) -> None:
+    # A JSON array cannot be extended in place, so the file is read back and rewritten
+    write_projects(read_projects(path, file_name) + projects, path, file_name, pretty)
@@ -0,0 +1,67 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from data.solution.model import Department, Project, Person
+
+class MemoryCursor:
+    def __init__(self, pool: "MemoryPool"):
+        self._pool = pool
+        self._rows = []
+
+    async def execute(self, statement: str) -> None:
+        await asyncio.sleep(self._pool.delay)
+        table = statement.rsplit("FROM", 1)[1].strip()
+        if table in self._pool.fail_on:
+            raise RuntimeError(f"Simulated failure reading {table}")
+        self._rows = list(self._pool.tables.get(table, []))
+
+    async def fetchmany(self, size: int) -> list:
+        await asyncio.sleep(self._pool.delay)
+        rows, self._rows = self._rows[:size], self._rows[size:]
+        return rows
+
+    def close(self) -> None:
+        self._rows = []
+
+class MemoryConnection:
+    def __init__(self, pool: "MemoryPool"):
+        self._pool = pool
+
+    def cursor(self) -> MemoryCursor:
+        return MemoryCursor(self._pool)
+
+class MemoryPool:
+    """
+    In-memory async stand-in for an oracledb connection pool, serving fixed rows per table.
+    Tracks how many connections are checked out so callers can verify they were released.
+    """
+
+    def __init__(self, tables: Dict[str, List[tuple]], delay: float = 0.0, fail_on: Optional[Iterable[str]] = None):
+        self.tables = tables
+        self.delay = delay
+        self.fail_on = set(fail_on or [])
+        self.in_use = 0
+        self.max_in_use = 0
+
+    @asynccontextmanager
+    async def acquire(self):
+        self.in_use += 1
+        self.max_in_use = max(self.max_in_use, self.in_use)
+        try:
+            yield MemoryConnection(self)
+        finally:
+            self.in_use -= 1
+
+    @classmethod
+    def from_data(cls, people: List[Person], departments: List[Department], projects: List[Project],
+                  dept_assignments: List[Tuple[str, str, str, int]], proj_assignments: List[Tuple[str, str]],
+                  **kwargs) -> "MemoryPool":
+        """Builds the tables with the same row layout the Oracle tables return."""
+        return cls({
+            "A_PERSON": [(p.id, p.name, p.age, 1 if p.male else 0) for p in people],
+            "A_DEPARTMENT": [(d.id, d.name, d.floor) for d in departments],
+            "A_PROJECT": [(p.id, p.name, p.budget, p.deadline, p.status) for p in projects],
+            "A_PERSON_DEPARTMENT": list(dept_assignments),
+            "A_PERSON_PROJECT": list(proj_assignments),
+        }, **kwargs)
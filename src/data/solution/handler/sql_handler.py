@@ -1,6 +1,7 @@
+import asyncio
 import oracledb
 import os
-from typing import List, Tuple
+from typing import AsyncIterator, Callable, List, Tuple
 from datetime import date
 from dotenv import load_dotenv
 
@@ -16,43 +17,28 @@ DB_SERVICE = os.getenv("DB_SERVICE", "ora21cp.inf.unideb.hu")
 DB_USER = os.getenv("DB_USER")  # No default for security
 DB_PASS = os.getenv("DB_PASS")  # No default for security
 
-def get_connection(user=DB_USER, password=DB_PASS):
-    dsn = f"{DB_HOST}:{DB_PORT}/{DB_SERVICE}"
-    return oracledb.connect(user=user, password=password, dsn=dsn)
+TABLES = ["A_PERSON_PROJECT", "A_PERSON_DEPARTMENT", "A_PROJECT", "A_DEPARTMENT", "A_PERSON"]
 
-def create_tables(conn):
-    cursor = conn.cursor()
-    
-    # Drop tables if they exist (reverse order of dependencies)
-    tables = ["A_PERSON_PROJECT", "A_PERSON_DEPARTMENT", "A_PROJECT", "A_DEPARTMENT", "A_PERSON"]
-    for table in tables:
-        try:
-            cursor.execute(f"DROP TABLE {table}")
-            print(f"Dropped table {table}")
-        except oracledb.DatabaseError:
-            pass # Table didn't exist
-
-    # Create PERSON table
-    cursor.execute("""
+CREATE_TABLE_STATEMENTS = [
+    # PERSON table
+    """
         CREATE TABLE A_PERSON (
             id VARCHAR2(50) PRIMARY KEY,
             name VARCHAR2(100),
             age NUMBER,
             male NUMBER(1)
         )
-    """)
-
-    # Create DEPARTMENT table
-    cursor.execute("""
+    """,
+    # DEPARTMENT table
+    """
         CREATE TABLE A_DEPARTMENT (
             id VARCHAR2(50) PRIMARY KEY,
             name VARCHAR2(100),
             floor NUMBER
         )
-    """)
-
-    # Create PROJECT table
-    cursor.execute("""
+    """,
+    # PROJECT table
+    """
         CREATE TABLE A_PROJECT (
             id VARCHAR2(50) PRIMARY KEY,
             name VARCHAR2(100),
@@ -60,10 +46,9 @@ def create_tables(conn):
             deadline DATE,
             status VARCHAR2(20)
         )
-    """)
-
-    # Create PERSON_DEPARTMENT table (1:N)
-    cursor.execute("""
+    """,
+    # PERSON_DEPARTMENT table (1:N)
+    """
         CREATE TABLE A_PERSON_DEPARTMENT (
             person_id VARCHAR2(50),
             department_id VARCHAR2(50),
@@ -73,10 +58,9 @@ def create_tables(conn):
             FOREIGN KEY (person_id) REFERENCES A_PERSON(id),
             FOREIGN KEY (department_id) REFERENCES A_DEPARTMENT(id)
         )
-    """)
-
-    # Create PERSON_PROJECT table (N:M)
-    cursor.execute("""
+    """,
+    # PERSON_PROJECT table (N:M)
+    """
         CREATE TABLE A_PERSON_PROJECT (
             person_id VARCHAR2(50),
             project_id VARCHAR2(50),
@@ -84,7 +68,69 @@ def create_tables(conn):
             FOREIGN KEY (person_id) REFERENCES A_PERSON(id),
             FOREIGN KEY (project_id) REFERENCES A_PROJECT(id)
         )
-    """)
+    """,
+]
+
+INSERT_PERSON = "INSERT INTO A_PERSON (id, name, age, male) VALUES (:1, :2, :3, :4)"
+INSERT_DEPARTMENT = "INSERT INTO A_DEPARTMENT (id, name, floor) VALUES (:1, :2, :3)"
+INSERT_PROJECT = "INSERT INTO A_PROJECT (id, name, budget, deadline, status) VALUES (:1, :2, :3, :4, :5)"
+INSERT_PERSON_DEPARTMENT = "INSERT INTO A_PERSON_DEPARTMENT (person_id, department_id, job, salary) VALUES (:1, :2, :3, :4)"
+INSERT_PERSON_PROJECT = "INSERT INTO A_PERSON_PROJECT (person_id, project_id) VALUES (:1, :2)"
+
+SELECT_PERSON = "SELECT id, name, age, male FROM A_PERSON"
+SELECT_DEPARTMENT = "SELECT id, name, floor FROM A_DEPARTMENT"
+SELECT_PROJECT = "SELECT id, name, budget, deadline, status FROM A_PROJECT"
+SELECT_PERSON_DEPARTMENT = "SELECT person_id, department_id, job, salary FROM A_PERSON_DEPARTMENT"
+SELECT_PERSON_PROJECT = "SELECT person_id, project_id FROM A_PERSON_PROJECT"
+
+def _dsn() -> str:
+    return f"{DB_HOST}:{DB_PORT}/{DB_SERVICE}"
+
+def _person_row(row) -> Person:
+    return Person(row[0], row[1], row[2], bool(row[3]))
+
+def _department_row(row) -> Department:
+    return Department(row[0], row[1], row[2])
+
+def _project_row(row) -> Project:
+    # Oracle returns datetime, we need date
+    d = row[3]
+    if hasattr(d, 'date'): d = d.date()
+    return Project(row[0], row[1], row[2], d, row[4])
+
+def _dept_assignment_row(row) -> Tuple[str, str, str, int]:
+    return (row[0], row[1], row[2], row[3])
+
+def _proj_assignment_row(row) -> Tuple[str, str]:
+    return (row[0], row[1])
+
+def _insert_batches(people: List[Person], departments: List[Department], projects: List[Project],
+                    dept_assignments: List[Tuple[str, str, str, int]], proj_assignments: List[Tuple[str, str]]) -> list:
+    """Returns (statement, rows) pairs in an order that satisfies the foreign keys."""
+    return [
+        (INSERT_PERSON, [(p.id, p.name, p.age, 1 if p.male else 0) for p in people]),
+        (INSERT_DEPARTMENT, [(d.id, d.name, d.floor) for d in departments]),
+        (INSERT_PROJECT, [(p.id, p.name, p.budget, p.deadline, p.status) for p in projects]),
+        (INSERT_PERSON_DEPARTMENT, dept_assignments),
+        (INSERT_PERSON_PROJECT, proj_assignments),
+    ]
+
+def get_connection(user=DB_USER, password=DB_PASS):
+    return oracledb.connect(user=user, password=password, dsn=_dsn())
+
+def create_tables(conn):
+    cursor = conn.cursor()
+    
+    # Drop tables if they exist (reverse order of dependencies)
+    for table in TABLES:
+        try:
+            cursor.execute(f"DROP TABLE {table}")
+            print(f"Dropped table {table}")
+        except oracledb.DatabaseError:
+            pass # Table didn't exist
+
+    for statement in CREATE_TABLE_STATEMENTS:
+        cursor.execute(statement)
     
     print("Tables created successfully.")
     cursor.close()
@@ -93,21 +139,9 @@ def insert_data(conn, people: List[Person], departments: List[Department], proje
                 dept_assignments: List[Tuple[str, str, str, int]], proj_assignments: List[Tuple[str, str]]):
     cursor = conn.cursor()
 
-    # Insert People
-    data_people = [(p.id, p.name, p.age, 1 if p.male else 0) for p in people]
-    cursor.executemany("INSERT INTO A_PERSON (id, name, age, male) VALUES (:1, :2, :3, :4)", data_people)
-
-    # Insert Departments
-    data_depts = [(d.id, d.name, d.floor) for d in departments]
-    cursor.executemany("INSERT INTO A_DEPARTMENT (id, name, floor) VALUES (:1, :2, :3)", data_depts)
-
-    # Insert Projects
-    data_projs = [(p.id, p.name, p.budget, p.deadline, p.status) for p in projects]
-    cursor.executemany("INSERT INTO A_PROJECT (id, name, budget, deadline, status) VALUES (:1, :2, :3, :4, :5)", data_projs)
-
-    # Insert Assignments
-    cursor.executemany("INSERT INTO A_PERSON_DEPARTMENT (person_id, department_id, job, salary) VALUES (:1, :2, :3, :4)", dept_assignments)
-    cursor.executemany("INSERT INTO A_PERSON_PROJECT (person_id, project_id) VALUES (:1, :2)", proj_assignments)
+    for statement, rows in _insert_batches(people, departments, projects, dept_assignments, proj_assignments):
+        if rows:
+            cursor.executemany(statement, rows)
 
     conn.commit()
     print("Data inserted successfully.")
@@ -116,23 +150,151 @@ def insert_data(conn, people: List[Person], departments: List[Department], proje
 def read_data(conn):
     cursor = conn.cursor()
     
-    # Read People
-    cursor.execute("SELECT id, name, age, male FROM A_PERSON")
-    people = [Person(row[0], row[1], row[2], bool(row[3])) for row in cursor]
+    cursor.execute(SELECT_PERSON)
+    people = [_person_row(row) for row in cursor]
     
-    # Read Departments
-    cursor.execute("SELECT id, name, floor FROM A_DEPARTMENT")
-    departments = [Department(row[0], row[1], row[2]) for row in cursor]
+    cursor.execute(SELECT_DEPARTMENT)
+    departments = [_department_row(row) for row in cursor]
     
-    # Read Projects
-    cursor.execute("SELECT id, name, budget, deadline, status FROM A_PROJECT")
-    projects = []
-    for row in cursor:
-        # Oracle returns datetime, we need date
-        d = row[3]
-        if hasattr(d, 'date'): d = d.date()
-        projects.append(Project(row[0], row[1], row[2], d, row[4]))
+    cursor.execute(SELECT_PROJECT)
+    projects = [_project_row(row) for row in cursor]
 
     print(f"Read {len(people)} people, {len(departments)} departments, {len(projects)} projects from DB.")
     cursor.close()
     return people, departments, projects
+
+# --- asyncio API (python-oracledb thin mode) ---
+
+async def connect_async(user=DB_USER, password=DB_PASS):
+    return await oracledb.connect_async(user=user, password=password, dsn=_dsn())
+
+def create_pool_async(user=DB_USER, password=DB_PASS, min: int = 1, max: int = 5):
+    """A pool is needed for concurrent reads: one connection only runs one statement at a time."""
+    return oracledb.create_pool_async(user=user, password=password, dsn=_dsn(), min=min, max=max)
+
+async def create_tables_async(conn):
+    cursor = conn.cursor()
+
+    # Drop tables if they exist (reverse order of dependencies)
+    for table in TABLES:
+        try:
+            await cursor.execute(f"DROP TABLE {table}")
+            print(f"Dropped table {table}")
+        except oracledb.DatabaseError:
+            pass # Table didn't exist
+
+    for statement in CREATE_TABLE_STATEMENTS:
+        await cursor.execute(statement)
+
+    print("Tables created successfully.")
+    cursor.close()
+
+async def insert_data_async(conn, people: List[Person], departments: List[Department], projects: List[Project],
+                            dept_assignments: List[Tuple[str, str, str, int]], proj_assignments: List[Tuple[str, str]]):
+    cursor = conn.cursor()
+
+    for statement, rows in _insert_batches(people, departments, projects, dept_assignments, proj_assignments):
+        if rows:
+            await cursor.executemany(statement, rows)
+
+    await conn.commit()
+    print("Data inserted successfully.")
+    cursor.close()
+
+_DONE = object()
+_CLOSED = object()
+
+async def _produce_batches(pool, statement: str, convert: Callable, batch_size: int, queue: asyncio.Queue) -> None:
+    try:
+        async with pool.acquire() as conn:
+            cursor = conn.cursor()
+            try:
+                await cursor.execute(statement)
+                while True:
+                    rows = await cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    await queue.put([convert(row) for row in rows])
+            finally:
+                cursor.close()
+    except Exception as e:
+        # Hand the error to the consumer instead of losing it inside the task
+        await queue.put(e)
+        return
+    await queue.put(_DONE)
+
+async def _consume_batches(queue: asyncio.Queue, task: asyncio.Task) -> AsyncIterator[list]:
+    try:
+        while True:
+            item = await queue.get()
+            if item is _DONE:
+                return
+            if item is _CLOSED:
+                # Distinguish a reader shut down mid-table from a table that was read to the end
+                raise RuntimeError("reader closed")
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        # Stop the reader if the consumer gives up early
+        task.cancel()
+
+class AsyncTableReader:
+    """
+    Owns the reader tasks started by read_data_async.
+
+    Iterating the reader yields the five batch iterators (people, departments, projects,
+    department assignments, project assignments), so it can be unpacked like a tuple.
+    Close it with aclose() or use it with async with, otherwise unread tables keep their
+    pooled connections.
+    """
+
+    def __init__(self, pool, sources: list, batch_size: int, max_pending_batches: int):
+        self._tasks = []
+        self._queues = []
+        iterators = []
+        for statement, convert in sources:
+            # Bounded queue: a slow consumer pauses its reader instead of buffering the whole table
+            queue = asyncio.Queue(maxsize=max_pending_batches)
+            task = asyncio.create_task(_produce_batches(pool, statement, convert, batch_size, queue))
+            self._tasks.append(task)
+            self._queues.append(queue)
+            iterators.append(_consume_batches(queue, task))
+        self.people, self.departments, self.projects, self.dept_assignments, self.proj_assignments = iterators
+
+    def __iter__(self):
+        return iter((self.people, self.departments, self.projects, self.dept_assignments, self.proj_assignments))
+
+    async def aclose(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        # Waiting here guarantees every connection is back in the pool when aclose returns
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for queue in self._queues:
+            # Drop unread batches and make any consumer, waiting now or later, fail instead of ending quietly
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(_CLOSED)
+
+    async def __aenter__(self) -> "AsyncTableReader":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+
+def read_data_async(pool, batch_size: int = 1000, max_pending_batches: int = 4) -> AsyncTableReader:
+    """
+    Starts reading all five tables concurrently, each on its own pooled connection.
+    Must be called from a running event loop.
+
+    Any object whose acquire() returns an async context manager yielding a connection
+    can stand in for the pool, e.g. memory_sql.MemoryPool.
+    """
+    sources = [
+        (SELECT_PERSON, _person_row),
+        (SELECT_DEPARTMENT, _department_row),
+        (SELECT_PROJECT, _project_row),
+        (SELECT_PERSON_DEPARTMENT, _dept_assignment_row),
+        (SELECT_PERSON_PROJECT, _proj_assignment_row),
+    ]
+    return AsyncTableReader(pool, sources, batch_size, max_pending_batches)
@@ -17,6 +17,15 @@ def write_departments(departments: List[Department], path: str, file_name: str =
         
     wb.save(os.path.join(path, file_name))
 
+def append_departments(departments: List[Department], path: str, file_name: str = "departments.xlsx") -> None:
+    wb = openpyxl.load_workbook(os.path.join(path, file_name))
+    ws = wb["Departments"]
+
+    for dept in departments:
+        ws.append([dept.id, dept.name, dept.floor])
+
+    wb.save(os.path.join(path, file_name))
+
 def read_departments(path: str, file_name: str = "departments.xlsx") -> List[Department]:
     wb = openpyxl.load_workbook(os.path.join(path, file_name))
     ws = wb["Departments"]
@@ -39,6 +48,15 @@ def write_projects(projects: List[Project], path: str, file_name: str = "project
         
     wb.save(os.path.join(path, file_name))
 
+def append_projects(projects: List[Project], path: str, file_name: str = "projects.xlsx") -> None:
+    wb = openpyxl.load_workbook(os.path.join(path, file_name))
+    ws = wb["Projects"]
+
+    for proj in projects:
+        ws.append([proj.id, proj.name, proj.budget, proj.deadline, proj.status])
+
+    wb.save(os.path.join(path, file_name))
+
 def read_projects(path: str, file_name: str = "projects.xlsx") -> List[Project]:
     wb = openpyxl.load_workbook(os.path.join(path, file_name))
     ws = wb["Projects"]
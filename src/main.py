@@ -1,9 +1,154 @@
+import argparse
+import asyncio
+import json
 import os
 import shutil
-from data.solution.generator import generate_people, generate_departments, generate_projects, assign_departments, assign_projects
+from data.solution.generator import generate_people, generate_departments, generate_projects, assign_departments, assign_projects, high_water_mark, id_number
 from data.solution.handler import csv_handler, json_handler, xlsx_handler, sql_handler
+from data.solution.handler.memory_sql import MemoryPool
 from data.solution import extra_pandas
 
+HIGH_WATER_MARKS_FILE = "high_water_marks.json"
+PENDING_APPEND_FILE = "pending_append.json"
+
+def write_json(path, data):
+    # Swap in a complete file, so a crash mid-write never leaves a truncated one
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(path + ".tmp", path)
+
+def write_high_water_marks(output_dir, marks):
+    write_json(os.path.join(output_dir, HIGH_WATER_MARKS_FILE), marks)
+
+def read_high_water_marks(output_dir):
+    with open(os.path.join(output_dir, HIGH_WATER_MARKS_FILE), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def rows_after(csv_dir, sql_marks):
+    """Reads the records the database is missing: everything numbered above its marks."""
+    people = [p for p in csv_handler.read_people(csv_dir) if id_number(p.id) > sql_marks["person"]]
+    departments = [d for d in csv_handler.read_departments(csv_dir) if id_number(d.id) > sql_marks["department"]]
+    projects = [p for p in csv_handler.read_projects(csv_dir) if id_number(p.id) > sql_marks["project"]]
+    dept_assignments = [a for a in csv_handler.read_dept_assignments(csv_dir) if id_number(a[0]) > sql_marks["person"]]
+    proj_assignments = [a for a in csv_handler.read_proj_assignments(csv_dir) if id_number(a[0]) > sql_marks["person"]]
+    return people, departments, projects, dept_assignments, proj_assignments
+
+def append_to_database(csv_dir, marks, new_rows):
+    """Inserts the new records, plus any the database missed in earlier runs. Returns False if it was skipped."""
+    sql_marks = marks.get("sql")
+    if sql_marks is None:
+        print("SQL append Skipped: the database was not loaded by a full run")
+        return False
+    try:
+        conn = sql_handler.get_connection()
+    except Exception as e:
+        # Nothing was inserted; the next run that can connect inserts these records too
+        print(f"SQL append Skipped: {e}")
+        return False
+    try:
+        if all(sql_marks[k] == marks[k] for k in ("person", "department", "project")):
+            rows = new_rows
+        else:
+            print("Database is behind the files, inserting the records it missed...")
+            rows = rows_after(csv_dir, sql_marks)
+        # Errors propagate: insert_data commits only at the end, so a failed insert leaves the database at its marks
+        sql_handler.insert_data(conn, *rows)
+    finally:
+        conn.close()
+    return True
+
+def begin_append(output_dir, appended_files, rewritten_files):
+    """Records how to undo an append: the sizes of append-only files and backups of files that get rewritten."""
+    backups = {}
+    for path in rewritten_files:
+        shutil.copy2(path, path + ".bak")
+        backups[path] = path + ".bak"
+    write_json(os.path.join(output_dir, PENDING_APPEND_FILE),
+               {"sizes": {path: os.path.getsize(path) for path in appended_files}, "backups": backups})
+
+def finish_append(output_dir):
+    journal_path = os.path.join(output_dir, PENDING_APPEND_FILE)
+    with open(journal_path, "r", encoding="utf-8") as f:
+        journal = json.load(f)
+    os.remove(journal_path)
+    for backup in journal["backups"].values():
+        os.remove(backup)
+
+def roll_back_append(output_dir):
+    """Undoes the file writes of an append that did not finish, so no file holds half of its records."""
+    journal_path = os.path.join(output_dir, PENDING_APPEND_FILE)
+    if not os.path.exists(journal_path):
+        return
+    print("Rolling back an incomplete append...")
+    with open(journal_path, "r", encoding="utf-8") as f:
+        journal = json.load(f)
+    for path, size in journal["sizes"].items():
+        with open(path, "r+b") as f:
+            f.truncate(size)
+    for path, backup in journal["backups"].items():
+        os.replace(backup, path)
+    os.remove(journal_path)
+
+async def sql_async_test(people, departments, projects, dept_assignments, proj_assignments):
+    conn = await sql_handler.connect_async()
+    try:
+        await sql_handler.create_tables_async(conn)
+        await sql_handler.insert_data_async(conn, people, departments, projects, dept_assignments, proj_assignments)
+    finally:
+        await conn.close()
+
+    pool = sql_handler.create_pool_async(max=5)
+    try:
+        return await count_async_rows(pool)
+    finally:
+        await pool.close()
+
+async def count_async_rows(pool, batch_size=1000):
+    counts = []
+    async with sql_handler.read_data_async(pool, batch_size=batch_size) as reader:
+        for batches in reader:
+            count = 0
+            async for batch in batches:
+                count += len(batch)
+            counts.append(count)
+    return counts
+
+async def memory_async_test(people, departments, projects, dept_assignments, proj_assignments):
+    expected = [len(people), len(departments), len(projects), len(dept_assignments), len(proj_assignments)]
+
+    # All five tables are read concurrently and in batches
+    pool = MemoryPool.from_data(people, departments, projects, dept_assignments, proj_assignments, delay=0.001)
+    assert await count_async_rows(pool, batch_size=100) == expected
+    assert pool.max_in_use == 5
+    assert pool.in_use == 0
+
+    # A failing table surfaces its error to the consumer of that table only
+    pool = MemoryPool.from_data(people, departments, projects, dept_assignments, proj_assignments, fail_on=["A_PROJECT"])
+    async with sql_handler.read_data_async(pool) as reader:
+        try:
+            async for _ in reader.projects:
+                pass
+            raise AssertionError("Expected the projects reader to fail")
+        except RuntimeError:
+            pass
+        assert sum([len(batch) async for batch in reader.people]) == len(people)
+    assert pool.in_use == 0
+
+    # Leaving early releases every connection, including tables that were never iterated
+    pool = MemoryPool.from_data(people, departments, projects, dept_assignments, proj_assignments, delay=0.001)
+    async with sql_handler.read_data_async(pool, batch_size=10, max_pending_batches=1) as reader:
+        async for _ in reader.people:
+            break
+    assert pool.in_use == 0
+
+    # Reading after close fails instead of looking like a complete (empty) table
+    try:
+        async for _ in reader.departments:
+            pass
+        raise AssertionError("Expected reading a closed reader to fail")
+    except RuntimeError:
+        pass
+
 def main():
     output_dir = "output"
     if os.path.exists(output_dir):
@@ -46,6 +191,23 @@ def main():
     assert len(read_projs) == len(projects)
     print("CSV Write/Read successful.")
 
+    # --- Partitioned CSV Test ---
+    print("\nTesting partitioned CSV Handler...")
+    partitioned_dir = os.path.join(csv_dir, "partitioned")
+    csv_handler.write_partitioned(people, dept_assignments, proj_assignments, partitioned_dir,
+                                  rows_per_partition=100, by_department=True)
+
+    read_people_part = csv_handler.read_people_partitioned(partitioned_dir)
+    assert len(read_people_part) == len(people)
+
+    # Partition pruning: only the first department's files are read
+    dept_id = departments[0].id
+    read_dept_people = csv_handler.read_people_partitioned(partitioned_dir, department_ids=[dept_id])
+    read_dept_assign = csv_handler.read_dept_assignments_partitioned(partitioned_dir, department_ids=[dept_id])
+    assert len(read_dept_people) == sum(1 for a in dept_assignments if a[1] == dept_id)
+    assert all(a[1] == dept_id for a in read_dept_assign)
+    print("Partitioned CSV Write/Read successful.")
+
     # --- JSON Test ---
     print("\nTesting JSON Handler...")
     json_handler.write_departments(departments, json_dir)
@@ -72,6 +234,7 @@ def main():
 
     # --- SQL Test ---
     print("\nTesting SQL Handler...")
+    sql_loaded = False
     try:
         # Requires VPN and valid credentials
         conn = sql_handler.get_connection()
@@ -82,16 +245,167 @@ def main():
         sql_handler.read_data(conn)
         
         conn.close()
+        sql_loaded = True
         print("SQL Write/Read successful.")
     except Exception as e:
         print(f"SQL Test Skipped/Failed: {e}")
         print("Ensure you are on the university network and have set the correct credentials in src/data/solution/handler/sql_handler.py")
 
+    # --- Async Reader Test (in-memory stand-in, no DB needed) ---
+    print("\nTesting async SQL reader against in-memory pool...")
+    asyncio.run(memory_async_test(people, departments, projects, dept_assignments, proj_assignments))
+    print("Async in-memory Read successful.")
+
+    # --- Async SQL Test ---
+    print("\nTesting async SQL Handler...")
+    try:
+        counts = asyncio.run(sql_async_test(people, departments, projects, dept_assignments, proj_assignments))
+        assert counts == [len(people), len(departments), len(projects), len(dept_assignments), len(proj_assignments)]
+        sql_loaded = True
+        print("Async SQL Write/Read successful.")
+    except Exception as e:
+        print(f"Async SQL Test Skipped/Failed: {e}")
+
     # --- Pandas Extra Test ---
     print("\nGenerating Statistics...")
-    extra_pandas.generate_statistics(csv_dir, output_dir)
+    marks = {"person": high_water_mark(p.id for p in people), "department": high_water_mark(d.id for d in departments),
+             "project": high_water_mark(p.id for p in projects)}
+    extra_pandas.generate_statistics(csv_dir, output_dir, person_mark=marks["person"])
+
+    # Marks the database has reached, so append can insert whatever it missed; None if it was never loaded
+    marks["sql"] = dict(marks) if sql_loaded else None
+
+    write_high_water_marks(output_dir, marks)
+
+    # --- Append Test ---
+    print("\nTesting append mode...")
+    new_people = append(50, n_departments=1, n_projects=2)
+
+    read_people_appended = csv_handler.read_people(csv_dir)
+    assert len(read_people_appended) == len(people) + 50
+    assert min(id_number(p.id) for p in new_people) == marks["person"] + 1
+    assert len(csv_handler.read_people_partitioned(partitioned_dir)) == len(read_people_appended)
+    assert len(json_handler.read_departments(json_dir)) == len(departments) + 1
+    assert len(xlsx_handler.read_projects(xlsx_dir)) == len(projects) + 2
+
+    aggregates = extra_pandas.read_aggregates(output_dir)
+    assert sum(d["count"] for d in aggregates["departments"].values()) == len(read_people_appended)
+    print("Append successful.")
     
     print("\nAll tests passed!")
 
+def append(n_people, n_departments=0, n_projects=0):
+    """Adds new records to the dataset produced by main() without regenerating or rewriting it."""
+    output_dir = "output"
+    csv_dir = os.path.join(output_dir, "csv")
+    json_dir = os.path.join(output_dir, "json")
+    xlsx_dir = os.path.join(output_dir, "xlsx")
+    partitioned_dir = os.path.join(csv_dir, "partitioned")
+
+    if not os.path.exists(os.path.join(csv_dir, "people.csv")):
+        raise FileNotFoundError(f"No existing dataset in {output_dir}, run without --append first")
+    roll_back_append(output_dir)
+
+    existing_depts = csv_handler.read_departments(csv_dir)
+    existing_projs = csv_handler.read_projects(csv_dir)
+    if os.path.exists(os.path.join(output_dir, HIGH_WATER_MARKS_FILE)):
+        marks = read_high_water_marks(output_dir)
+    else:
+        # Dataset generated before marks were recorded: derive them once from the data
+        marks = {"person": high_water_mark(p.id for p in csv_handler.read_people(csv_dir)),
+                 "department": high_water_mark(d.id for d in existing_depts),
+                 "project": high_water_mark(p.id for p in existing_projs)}
+        write_high_water_marks(output_dir, marks)
+
+    # Check every output we are about to extend before touching any of them
+    csv_files = [os.path.join(csv_dir, f) for f in ["people.csv", "departments.csv", "projects.csv", "dept_assignments.csv", "proj_assignments.csv"]]
+    rewritten_files = []
+    if n_departments:
+        rewritten_files += [os.path.join(json_dir, "departments.json"), os.path.join(xlsx_dir, "departments.xlsx")]
+    if n_projects:
+        rewritten_files += [os.path.join(json_dir, "projects.json"), os.path.join(xlsx_dir, "projects.xlsx")]
+    if os.path.isdir(partitioned_dir):
+        rewritten_files.append(os.path.join(partitioned_dir, csv_handler.MANIFEST_FILE))
+    missing = [path for path in csv_files + rewritten_files if not os.path.exists(path)]
+    if missing:
+        raise FileNotFoundError(f"Cannot append, missing outputs: {', '.join(missing)}")
+
+    print("Generating new data...")
+    new_depts = generate_departments(n_departments, start=marks["department"] + 1)
+    new_projs = generate_projects(n_projects, start=marks["project"] + 1)
+    departments = existing_depts + new_depts
+    projects = existing_projs + new_projs
+
+    new_people = generate_people(n_people, start=marks["person"] + 1)
+    dept_assignments = assign_departments(new_people, departments)
+    proj_assignments = assign_projects(new_people, projects)
+
+    print(f"Generated {len(new_people)} people, {len(new_depts)} departments, {len(new_projs)} projects.")
+
+    # Reserve the new IDs before writing any output: if a later step fails, the next run
+    # skips these IDs instead of reusing ones that may already be in the files
+    new_marks = dict(marks,
+                     person=max(marks["person"], high_water_mark(p.id for p in new_people)),
+                     department=max(marks["department"], high_water_mark(d.id for d in new_depts)),
+                     project=max(marks["project"], high_water_mark(p.id for p in new_projs)))
+    write_high_water_marks(output_dir, new_marks)
+
+    # File writes are journaled: a run that dies part-way is rolled back at the start of the next one
+    begin_append(output_dir, csv_files, rewritten_files)
+
+    # --- CSV ---
+    csv_handler.write_people(new_people, csv_dir, append=True)
+    csv_handler.write_departments(new_depts, csv_dir, append=True)
+    csv_handler.write_projects(new_projs, csv_dir, append=True)
+    csv_handler.write_dept_assignments(dept_assignments, csv_dir, append=True)
+    csv_handler.write_proj_assignments(proj_assignments, csv_dir, append=True)
+
+    # --- JSON / XLSX (only departments and projects are stored there) ---
+    if new_depts:
+        json_handler.append_departments(new_depts, json_dir)
+        xlsx_handler.append_departments(new_depts, xlsx_dir)
+    if new_projs:
+        json_handler.append_projects(new_projs, json_dir)
+        xlsx_handler.append_projects(new_projs, xlsx_dir)
+
+    # --- Partitioned CSV (last, its manifest swap publishes the new partitions) ---
+    if os.path.isdir(partitioned_dir):
+        csv_handler.append_partitioned(new_people, dept_assignments, proj_assignments, partitioned_dir)
+
+    finish_append(output_dir)
+    if os.path.isdir(partitioned_dir):
+        csv_handler.remove_unreferenced_partitions(partitioned_dir)
+    print("File append successful.")
+
+    # --- Statistics ---
+    try:
+        covered = extra_pandas.read_aggregates(output_dir).get("person_mark")
+    except (OSError, ValueError):
+        covered = None
+    if covered == marks["person"]:
+        extra_pandas.update_statistics(new_people, departments, new_projs, dept_assignments, output_dir,
+                                       person_mark=new_marks["person"])
+    else:
+        # The aggregates missed an earlier run (or are missing): merging would leave that run out for good
+        print("Statistics are behind the data, rebuilding them from the CSV files...")
+        extra_pandas.build_statistics(csv_dir, output_dir, person_mark=new_marks["person"])
+
+    # --- SQL ---
+    if append_to_database(csv_dir, marks, (new_people, new_depts, new_projs, dept_assignments, proj_assignments)):
+        new_marks["sql"] = {k: new_marks[k] for k in ("person", "department", "project")}
+        write_high_water_marks(output_dir, new_marks)
+        print("SQL append successful.")
+
+    return new_people
+
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--append", type=int, metavar="N", help="add N new people to the existing output instead of regenerating it")
+    parser.add_argument("--departments", type=int, default=0, help="new departments to add in append mode")
+    parser.add_argument("--projects", type=int, default=0, help="new projects to add in append mode")
+    args = parser.parse_args()
+
+    if args.append is not None:
+        append(args.append, args.departments, args.projects)
+    else:
+        main()